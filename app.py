@@ -1,7 +1,10 @@
 import os
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
 from zoneinfo import ZoneInfo
 import math
@@ -11,8 +14,13 @@ from scrape import scrape_lottery_net_df, STATE_SLUGS
 st.set_page_config(page_title="Lottery Luck Dashboard", page_icon="🍀", layout="wide")
 
 # --- Custom CSS Import ---
-with open("theme.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+@st.cache_resource
+def load_theme_css():
+    """Reads theme.css once per server process rather than on every rerun."""
+    with open("theme.css") as f:
+        return f.read()
+
+st.markdown(f"<style>{load_theme_css()}</style>", unsafe_allow_html=True)
 
 # --- Helper Functions ---
 def format_large_number(num):
@@ -37,12 +45,37 @@ def format_currency(num):
         return f"${format_large_number(num)}"
     return f"${num:.0f}"
 
+def format_currency_series(values):
+    """Vectorized format_currency for a numeric Series."""
+    vals = values.to_numpy(dtype=float)
+    missing = np.isnan(vals)
+    vals = np.where(missing, 0.0, vals)
+    conditions = [vals >= 1_000_000_000, vals >= 1_000_000, vals >= 1_000]
+    scaled = np.select(conditions, [vals / 1_000_000_000, vals / 1_000_000, vals / 1_000], default=vals)
+    suffix = np.select(conditions, ["B", "M", "K"], default="")
+    # Suffixed amounts keep one decimal, plain dollar amounts none; printf rounding
+    # matches the f-strings in format_currency / format_large_number
+    digits = np.where(vals >= 1_000, np.char.mod("%.1f", scaled), np.char.mod("%.0f", scaled))
+    formatted = np.char.add(np.char.add("$", digits), suffix)
+    return pd.Series(np.where(missing, "Unknown", formatted), index=values.index, dtype=object)
+
+def format_fixed_series(values, decimals):
+    """Vectorized f"{x:.{decimals}f}" for a numeric Series (NaN becomes "nan")."""
+    text = np.char.mod(f"%.{decimals}f", values.to_numpy(dtype=float))
+    return pd.Series(text, index=values.index, dtype=object)
+
 def format_percent(num):
     """Formats a float as a percentage with 1 decimal place."""
     if num is None or math.isnan(num):
         return "0%"
     return f"{num:.1f}%"
 
+def save_data_csv(df, filename):
+    """Writes a scraped frame to CSV with pyarrow's writer; nested prize_data is stored as text."""
+    if "prize_data" in df.columns:
+        df = df.assign(prize_data=df["prize_data"].astype(str))
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), filename)
+
 # --- Session State for User Guide ---
 if "first_visit" not in st.session_state:
     st.session_state["first_visit"] = True
@@ -96,12 +129,12 @@ with col_state_select:
 DATA_FILE = f"scratchoffs_{selected_state}.csv"
 
 with col_refresh:
-    if st.button("🔄 Refresh", help="Force scrape fresh data"):
+    if st.button("🔄 Refresh", help="Re-scrape the games list; prize tables are reused for up to 24h"):
         with st.spinner(f"Scraping {selected_state}..."):
-            st.cache_data.clear()
+            # Writing the CSV bumps its mtime, which invalidates only this state's cache entry
             fresh_df = scrape_lottery_net_df(selected_state)
             if not fresh_df.empty:
-                fresh_df.to_csv(DATA_FILE, index=False)
+                save_data_csv(fresh_df, DATA_FILE)
             st.success("Updated!")
             st.rerun()
 
@@ -110,27 +143,55 @@ with col_help:
         user_guide_dialog()
 
 # --- Data Loading Logic ---
-@st.cache_data
-def load_data_cached(state_abbr):
+# Explicit column types let pyarrow parse the CSV without dtype inference
+CSV_COLUMN_TYPES = {
+    "scrape_ts": pa.string(),
+    "price": pa.float64(),
+    "overall_odds_1_in": pa.float64(),
+    "top_prize_amount": pa.float64(),
+    "top_prizes_remaining": pa.float64(),  # counts may be written as "3.0"
+    "all_prizes_remaining": pa.float64(),
+    "true_ev": pa.float64(),
+}
+
+# One entry per state is enough; older mtimes and frames are evicted instead of piling up
+@st.cache_data(max_entries=len(STATE_SLUGS))
+def load_data_cached(state_abbr, mtime):
     """
     Loads data from CSV if exists, otherwise scrapes.
-    Cached by Streamlit to prevent re-loading/re-scraping on every interaction.
+    Cached by Streamlit on (state, file mtime) to prevent re-loading/re-scraping
+    on every interaction while still picking up refreshed files.
     """
     filename = f"scratchoffs_{state_abbr}.csv"
     if os.path.exists(filename):
         try:
-            return pd.read_csv(filename)
-        except Exception:
+            table = pacsv.read_csv(
+                filename,
+                convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES),
+            )
+            return table.to_pandas()
+        except Exception as e:
+            # Unexpected values in a typed column (or an unreadable file): retry with pandas' lenient parser
+            st.warning(f"pyarrow could not parse {filename} ({e}); falling back to pandas")
+        try:
+            df = pd.read_csv(filename)
+        except Exception as e:
+            st.warning(f"Could not read {filename}: {e}")
             return pd.DataFrame()
+        for c in CSV_COLUMN_TYPES:
+            if c != "scrape_ts" and c in df.columns:
+                df[c] = pd.to_numeric(df[c], errors="coerce")
+        return df
     
     # If no file exists, scrape
     df = scrape_lottery_net_df(state_abbr)
     if not df.empty:
-        df.to_csv(filename, index=False)
+        save_data_csv(df, filename)
     return df
 
 # Load data
-df = load_data_cached(selected_state)
+mtime = os.path.getmtime(DATA_FILE) if os.path.exists(DATA_FILE) else 0.0
+df = load_data_cached(selected_state, mtime)
 
 # Display Last Fetched Date
 last_fetched_str = "Unknown"
@@ -148,32 +209,131 @@ st.caption(f"Last Fetched: **{last_fetched_str}**")
 
 
 # --- Pre-processing / Calculations ---
-if not df.empty:
-    # Ensure relevant columns exist and are numeric
-    cols_to_numeric = ["price", "overall_odds_1_in", "top_prize_amount", "top_prizes_remaining", "all_prizes_remaining", "true_ev"]
-    for c in cols_to_numeric:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    # Win Probability (1 / odds) * 100 for percentage
-    if "overall_odds_1_in" in df.columns:
-        df["win_probability"] = (1 / df["overall_odds_1_in"] * 100).where(df["overall_odds_1_in"] > 0)
-    
+@st.cache_data(max_entries=len(STATE_SLUGS))
+def preprocess(df):
+    """
+    Derives win probability, dead-game flag and display EV, plus the best games by EV and odds.
+    Cached on the input frame so widget-triggered reruns skip the work.
+    """
+    # Numeric columns arrive typed from the CSV reader / scraper
+    if "true_ev" not in df.columns:
+        df["true_ev"] = np.nan
+
+    odds = df["overall_odds_1_in"].to_numpy(dtype=float)
+    top_prize = df["top_prize_amount"].to_numpy(dtype=float)
+    true_ev = df["true_ev"].to_numpy(dtype=float)
+
+    # Win Probability (1 / odds) * 100 for percentage, and a fallback EV
+    # estimate from the top prize, both only where odds are known
+    valid_odds = odds > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        win_probability = np.where(valid_odds, 100.0 / odds, np.nan)
+        estimated_ev = np.where(valid_odds, top_prize / odds, np.nan)
+
     # Is Dead?
     if "top_prizes_remaining" in df.columns:
-        df["is_dead"] = df["top_prizes_remaining"] == 0
+        is_dead = df["top_prizes_remaining"] == 0
     elif "all_prizes_remaining" in df.columns:
-        df["is_dead"] = df["all_prizes_remaining"] == 0
+        is_dead = df["all_prizes_remaining"] == 0
     else:
-        df["is_dead"] = False
+        is_dead = False
 
     # EV (Prefer true_ev, fallback to estimated)
-    if "true_ev" not in df.columns:
-        df["true_ev"] = None
-    
-    # Fallback EV calc for display if true_ev is missing
-    df["estimated_ev"] = (df["top_prize_amount"] / df["overall_odds_1_in"]).where((df["overall_odds_1_in"] > 0))
-    df["display_ev"] = df["true_ev"].fillna(df["estimated_ev"])
+    df = df.assign(
+        win_probability=win_probability,
+        is_dead=is_dead,
+        estimated_ev=estimated_ev,
+        display_ev=np.where(np.isnan(true_ev), estimated_ev, true_ev),
+    )
+
+    # Best games for the stats cards, located in a single idxmax pass
+    best_cols = [c for c in ["display_ev", "win_probability"] if df[c].notna().any()]
+    idxs = df[best_cols].idxmax()
+    best = df.loc[idxs.values, ["game_name", "display_ev", "win_probability"]]
+    best_games = {col: best.iloc[i] for i, col in enumerate(best_cols)}
+    return df, best_games
+
+best_games = {}
+if not df.empty:
+    df, best_games = preprocess(df)
+
+
+# --- Charts ---
+# Above this many games the scatter is replaced by a binned heatmap to keep the browser responsive
+MAX_SCATTER_POINTS = 10_000
+
+def style_market_fig(fig):
+    """Applies the shared dashboard layout to a market overview figure."""
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=10, b=10), # Tight margins
+        height=450, # Fixed height to fit
+        xaxis_title="Ticket Price ($)",
+        yaxis_title="Expected Value ($)",
+    )
+    return fig
+
+@st.cache_data(max_entries=len(STATE_SLUGS))
+def build_market_fig(plot_key, _plot_df):
+    """
+    Builds the market overview scatter (or a density heatmap for very large frames).
+    Cached on plot_key (a hash of the plot rows) so Streamlit doesn't hash the frame itself.
+    """
+    if len(_plot_df) > MAX_SCATTER_POINTS:
+        fig = px.density_heatmap(
+            _plot_df,
+            x="price",
+            y="display_ev",
+            nbinsx=50,
+            nbinsy=50,
+            labels={"price": "Ticket Price ($)", "display_ev": "Expected Value ($)"},
+            color_continuous_scale="Viridis",
+            template="plotly_dark"
+        )
+        return style_market_fig(fig)
+
+    plot_df = _plot_df.copy()
+    # Add formatted columns for hover BEFORE filling NaNs for size
+    # This ensures the tooltip shows "Unknown" but the size calc doesn't crash
+    plot_df["formatted_jackpot"] = format_currency_series(plot_df["top_prize_amount"])
+    plot_df["formatted_ev"] = "$" + format_fixed_series(plot_df["display_ev"], 2)
+    plot_df["formatted_win"] = format_fixed_series(plot_df["win_probability"], 1) + "%"
+
+    # Now fill NaN jackpots with 0 so the bubble size logic works (Value cannot be NaN for size)
+    plot_df["top_prize_amount"] = plot_df["top_prize_amount"].fillna(0)
+
+    fig = px.scatter(
+        plot_df,
+        x="price",
+        y="display_ev",
+        color="win_probability",
+        size="top_prize_amount", # Bubble size based on jackpot
+        hover_name="game_name",
+        hover_data={
+            "game_name": False, # Shown in title
+            "price": ":$,.0f",
+            "formatted_ev": True,
+            "formatted_win": True,
+            "formatted_jackpot": True,
+            "display_ev": False,
+            "win_probability": False,
+            "top_prize_amount": False
+        },
+        labels={
+            "price": "Ticket Price ($)",
+            "formatted_ev": "True EV",
+            "formatted_win": "Win Prob",
+            "formatted_jackpot": "Jackpot"
+        },
+        title=None, # Clean look
+        color_continuous_scale="Viridis",
+        template="plotly_dark",
+        render_mode="webgl" # scattergl: GPU markers instead of SVG
+    )
+    # Only hit-test the nearest point on hover; no spike-line scan across all points
+    fig.update_layout(hovermode="closest", spikedistance=0)
+    return style_market_fig(fig)
 
 
 # --- Main Dashboard Layout ---
@@ -188,60 +348,20 @@ col_chart, col_stats = st.columns([3, 1])
 
 with col_chart:
     # Prepare data for plot
-    plot_df = df.dropna(subset=["price", "display_ev"]).copy()
+    plot_df = df.dropna(subset=["price", "display_ev"])
     if not plot_df.empty:
-        # Add formatted columns for hover BEFORE filling NaNs for size
-        # This ensures the tooltip shows "Unknown" but the size calc doesn't crash
-        plot_df["formatted_jackpot"] = plot_df["top_prize_amount"].apply(format_currency)
-        plot_df["formatted_ev"] = plot_df["display_ev"].apply(lambda x: f"${x:.2f}")
-        plot_df["formatted_win"] = plot_df["win_probability"].apply(lambda x: f"{x:.1f}%")
-
-        # Now fill NaN jackpots with 0 so the bubble size logic works (Value cannot be NaN for size)
-        plot_df["top_prize_amount"] = plot_df["top_prize_amount"].fillna(0)
-
-        fig = px.scatter(
-            plot_df,
-            x="price",
-            y="display_ev",
-            color="win_probability",
-            size="top_prize_amount", # Bubble size based on jackpot
-            hover_name="game_name",
-            hover_data={
-                "game_name": False, # Shown in title
-                "price": ":$,.0f",
-                "formatted_ev": True,
-                "formatted_win": True,
-                "formatted_jackpot": True,
-                "display_ev": False,
-                "win_probability": False,
-                "top_prize_amount": False
-            },
-            labels={
-                "price": "Ticket Price ($)",
-                "formatted_ev": "True EV",
-                "formatted_win": "Win Prob",
-                "formatted_jackpot": "Jackpot"
-            },
-            title=None, # Clean look
-            color_continuous_scale="Viridis",
-            template="plotly_dark"
-        )
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            margin=dict(l=10, r=10, t=10, b=10), # Tight margins
-            height=450, # Fixed height to fit
-            xaxis_title="Ticket Price ($)",
-            yaxis_title="Expected Value ($)",
-        )
+        # Key on the columns the figure uses; other columns (e.g. prize_data lists) may be unhashable
+        plot_cols = ["game_name", "price", "display_ev", "win_probability", "top_prize_amount"]
+        plot_key = pd.util.hash_pandas_object(plot_df[plot_cols], index=True).values.tobytes()
+        fig = build_market_fig(plot_key, plot_df)
         st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
     else:
         st.info("Not enough data for chart.")
 
 with col_stats:
     # Quick Stats Cards - Simplified, No Arrows
-    best_ev_game = df.loc[df["display_ev"].idxmax()] if not df.empty else None
-    best_odds_game = df.loc[df["win_probability"].idxmax()] if not df.empty else None
+    best_ev_game = best_games.get("display_ev")
+    best_odds_game = best_games.get("win_probability")
     
     # Card 1: Best Value
     st.markdown("#### 💎 Best Value")
@@ -274,9 +394,11 @@ with f_col1:
     available_prices = sorted(df["price"].dropna().unique()) if "price" in df.columns else []
     price_filter = st.multiselect("Price ($)", available_prices, default=available_prices)
 
-filtered_df = df.copy()
-if price_filter and "price" in filtered_df.columns:
-    filtered_df = filtered_df[filtered_df["price"].isin(price_filter)]
+# Boolean mask instead of copying the whole frame; only the displayed subset is materialized
+if price_filter and "price" in df.columns:
+    mask = df["price"].isin(price_filter)
+else:
+    mask = slice(None)
 
 # Rename columns for display
 display_map = {
@@ -291,8 +413,8 @@ display_map = {
 }
 
 # Simplify Dataframe
-display_cols = [c for c in display_map.keys() if c in filtered_df.columns]
-final_df = filtered_df[display_cols].rename(columns=display_map)
+display_cols = [c for c in display_map.keys() if c in df.columns]
+final_df = df.loc[mask, display_cols].rename(columns=display_map)
 
 # Add Status Column using boolean
 if "Dead" in final_df.columns:
@@ -304,20 +426,8 @@ else:
 final_cols = ["Status", "Game", "Price", "EV", "Top Prize", "Win %", "Odds (1 in)", "Top Rem."]
 final_df = final_df[[c for c in final_cols if c in final_df.columns]]
 
-# Create formatted versions of large numbers for a custom displayed dataframe if we wanted full control
-# But st.dataframe column_config is better for sorting.
-# We will use column_config format parameters, but standard printf "%d" doesn't do "1M".
-# So we rely on standard numbers for the table to keep sorting working, but maybe use a tooltip or standard formatting.
-# The user asked to "round of all the numbers used and ensure the numbers are formatted well, ifi is a lrge number it shows M, B K".
-# st.column_config doesn't support 'format' functions, only printf strings.
-# So to get K/M/B in the table we actually MUST convert to string. If we do that, sorting breaks.
-# A compromise: showing them as strings, but maybe we can keep sorting if we use a different app approach (ag-grid), but for simple streamlit:
-# We will convert to formatted strings for "Top Prize". For "Price" and "EV" standard currency is fine.
-
-# Apply custom formatting to Top Prize for the table display
-if "Top Prize" in final_df.columns:
-    final_df["Top Prize"] = final_df["Top Prize"].apply(format_currency)
-
+# "Top Prize" stays numeric so the column sorts correctly; the "compact"
+# format renders K/M/B suffixes in the browser.
 st.dataframe(
     final_df,
     use_container_width=True,
@@ -329,7 +439,7 @@ st.dataframe(
         "Odds (1 in)": st.column_config.NumberColumn(format="%.2f"),
         "Game": st.column_config.TextColumn(width="medium"),
         "Status": st.column_config.TextColumn(width="small"),
-        "Top Prize": st.column_config.TextColumn(label="Top Prize"), # Treat as text now
+        "Top Prize": st.column_config.NumberColumn(label="Top Prize ($)", format="compact"),
     },
     height=600
 )
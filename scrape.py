@@ -2,15 +2,22 @@
 import argparse
 import csv
 import json
+import os
 import re
+import tempfile
+import threading
 import time
-from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, field, fields
 from datetime import datetime, timezone
-from typing import List, Dict, Optional, Union
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 
 
 STATE_SLUGS = {
@@ -31,20 +38,38 @@ HDRS = {
     "Referer": "https://www.lottery.net/",
 }
 
+# Detail pages are fetched concurrently; the rate limiter keeps us polite.
+DETAIL_WORKERS = 12
+REQUESTS_PER_SECOND = 4.0
+MAX_CONSECUTIVE_FAILURES = 3
+
+# Throttled (429) and server-error responses pause all workers, then retry; success never sleeps
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.25  # seconds, doubled per attempt
+BACKOFF_CAP = 4.0
+RETRY_AFTER_CAP = 30.0
+
+# Prize tables are cached per detail URL so refreshes only refetch stale games
+DETAIL_CACHE_FILE = ".lottery_detail_cache.json"
+DETAIL_CACHE_TTL = 24 * 60 * 60  # seconds
+
 # ---------- Helpers ----------
 MONEY_RE = re.compile(r"\$?\s*([\d,]+(?:\.\d{2})?)")
 ODDS_RE = re.compile(r"1\s*in\s*([\d\.]+)", re.I)
 INT_RE = re.compile(r"\d+")
+TICKET_RE = re.compile(r"ticket|free", re.I)
+_MONEY_TRANS = str.maketrans("", "", "$, ")
 
 def now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 def to_float_money(s: str) -> Optional[float]:
     if not s: return None
-    if "ticket" in s.lower() or "free" in s.lower():
+    if TICKET_RE.search(s):
          return 0.0 # Placeholder, will be handled in EV calc if needed
     m = MONEY_RE.search(s)
-    return float(m.group(1).replace(",", "")) if m else None
+    return float(m.group(1).translate(_MONEY_TRANS)) if m else None
 
 def to_float_odds(s: str) -> Optional[float]:
     if not s: return None
@@ -77,27 +102,94 @@ class ScratchRow:
     prize_data: List[Dict] = field(default_factory=list)
     true_ev: Optional[float] = None
 
+# ---------- HTTP ----------
+class RateLimiter:
+    """Token bucket shared across worker threads to cap requests/sec globally."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.last:
+                    # paused: nobody gets a token until the pause ends
+                    wait = self.last - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+                    self.last = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every worker for `seconds` (overlapping pauses don't stack)."""
+        with self.lock:
+            self.tokens = 0.0
+            self.last = max(self.last, time.monotonic() + seconds)
+
+RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+
+def make_session() -> requests.Session:
+    """Session with a connection pool large enough to be shared by all workers."""
+    session = requests.Session()
+    session.headers.update(HDRS)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 # ---------- Core scraper ----------
-def fetch_html(url: str) -> str:
-    r = requests.get(url, headers=HDRS, timeout=30)
+def retry_delay(r: requests.Response, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After on 429, else exponential backoff."""
+    if r.status_code == 429:
+        retry_after = r.headers.get("Retry-After", "").strip()
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_AFTER_CAP)
+        # Retry-After may also be an HTTP-date
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None and retry_at.tzinfo is not None:
+            return min(max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0), RETRY_AFTER_CAP)
+    return min(BACKOFF_BASE * 2 ** attempt, BACKOFF_CAP)
+
+def fetch_html(session: requests.Session, url: str) -> str:
+    for attempt in range(MAX_RETRIES + 1):
+        RATE_LIMITER.acquire()
+        r = session.get(url, timeout=30)
+        if r.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        # Pause the shared limiter so every worker backs off, not just this one
+        RATE_LIMITER.pause(retry_delay(r, attempt))
     r.raise_for_status()
     return r.text
 
-def parse_table(table) -> List[Dict[str, Union[str, Optional[str]]]]:
-    """Return list of dicts {header: cell_text, 'href': link} for a <table>."""
+def node_text(node) -> str:
+    return clean(node.text(deep=True, separator=" "))
+
+def parse_table(table) -> Tuple[List[str], List[Dict[str, Union[str, Optional[str]]]]]:
+    """Return (headers, rows) where rows are dicts {header: cell_text, '_href': link} for a <table>."""
     headers = []
     # header row may be in <thead> or first <tr>
-    thead = table.find("thead")
+    thead = table.css_first("thead")
     if thead:
-        ths = thead.find_all("th")
-        headers = [clean(th.get_text(" ")) for th in ths]
+        headers = [node_text(th) for th in thead.css("th")]
     if not headers:
-        first_tr = table.find("tr")
+        first_tr = table.css_first("tr")
         if first_tr:
-            headers = [clean(th.get_text(" ")) for th in first_tr.find_all(["th", "td"])]
+            headers = [node_text(th) for th in first_tr.css("th, td")]
     rows = []
-    for tr in table.find_all("tr"):
-        tds = tr.find_all("td")
+    for tr in table.css("tr"):
+        tds = tr.css("td")
         if not tds:
             continue
         
@@ -105,12 +197,12 @@ def parse_table(table) -> List[Dict[str, Union[str, Optional[str]]]]:
         cells = []
         row_href = None
         for i, td in enumerate(tds):
-            text = clean(td.get_text(" "))
+            text = node_text(td)
             cells.append(text)
             if i == 0: # Check for link in the first column (Game Name)
-                a_tag = td.find("a", href=True)
+                a_tag = td.css_first("a[href]")
                 if a_tag:
-                    row_href = a_tag["href"]
+                    row_href = a_tag.attributes.get("href")
 
         # align to headers by position
         row = {}
@@ -122,39 +214,75 @@ def parse_table(table) -> List[Dict[str, Union[str, Optional[str]]]]:
             row["_href"] = row_href
             
         rows.append(row)
-    return rows
+    return headers, rows
+
+# Candidate header names (lowercase) per normalized field, in order of preference.
+FIELD_CANDIDATES = {
+    "game_name": ("game", "scratch-off", "ticket", "name", "title"),
+    "price": ("ticket price", "price", "cost"),
+    "odds": ("overall odds", "odds"),
+    "top_prize": ("top prize", "largest prize", "jackpot"),
+    "top_remaining": ("top prizes remaining", "remaining top prizes", "top remaining"),
+    "all_remaining": ("prizes remaining", "total prizes remaining", "remaining prizes"),
+    "game_number": ("game number", "number", "no.", "id", "game #"),
+}
+
+# One regex per field whose alternatives are tried in priority order: the first
+# branch that matches names the best candidate contained in the header, so a
+# single match per header replaces the per-candidate substring scans.
+FIELD_PATTERNS = {
+    name: re.compile("|".join(f".*?({re.escape(c)})" for c in candidates))
+    for name, candidates in FIELD_CANDIDATES.items()
+}
 
-def normalize_row(row: Dict[str, str], state: str) -> ScratchRow:
+def resolve_headers(headers: List[str]) -> Dict[str, Optional[str]]:
     """
-    Map varying column headers into our normalized fields.
+    Map each normalized field to the table header it should be read from.
+    An exact header match wins over a partial one; among either kind the
+    earlier candidate wins, then the earlier header. Runs once per table.
     """
-    # Build a lowercase->value map for fuzzy matching
-    lower_map = {clean(k).lower(): v for k, v in row.items()}
-
-    def pick(*candidates):
-        for c in candidates:
-            if c in lower_map and lower_map[c]:
-                return lower_map[c]
-        # fuzzy partial
-        for c in candidates:
-            for key, val in lower_map.items():
-                if c in key and val:
-                    return val
-        return None
-
-    game_name = pick("game", "scratch-off", "ticket", "name", "title")
-    price_txt = pick("ticket price", "price", "cost")
-    odds_txt = pick("overall odds", "odds")
-    top_prize_txt = pick("top prize", "largest prize", "jackpot")
-    top_remaining_txt = pick("top prizes remaining", "remaining top prizes", "top remaining")
-    all_remaining_txt = pick("prizes remaining", "total prizes remaining", "remaining prizes")
-    game_number_txt = pick("game number", "number", "no.", "id", "game #")
+    lowered = [clean(h).lower() for h in headers]
+    resolved = {}
+    for name, pattern in FIELD_PATTERNS.items():
+        candidates = FIELD_CANDIDATES[name]
+        best = None  # (is_partial, candidate rank, header position)
+        for pos, low in enumerate(lowered):
+            if low in candidates:
+                key = (False, candidates.index(low), pos)
+            else:
+                m = pattern.match(low)
+                if not m:
+                    continue
+                key = (True, m.lastindex - 1, pos)
+            if best is None or key < best:
+                best = key
+        resolved[name] = headers[best[2]] if best else None
+    return resolved
+
+def normalize_row(row: Dict[str, str], state: str, resolved: Dict[str, Optional[str]], scrape_ts: str) -> ScratchRow:
+    """
+    Map varying column headers into our normalized fields using a resolve_headers() map.
+    scrape_ts is shared by every row of a scrape run.
+    """
+    # Headers are resolved once per table, so an empty cell in the chosen column yields None
+    # rather than falling through to the next matching column as the old per-row pick() did.
+    def get(field):
+        header = resolved.get(field)
+        return (row.get(header) or None) if header else None
+
+    game_name = get("game_name")
+    price_txt = get("price")
+    odds_txt = get("odds")
+    top_prize_txt = get("top_prize")
+    top_remaining_txt = get("top_remaining")
+    all_remaining_txt = get("all_remaining")
+    game_number_txt = get("game_number")
     detail_url = row.get("_href")
 
     return ScratchRow(
         state=state,
         source="lottery_net",
-        scrape_ts=now_iso(),
+        scrape_ts=scrape_ts,
         game_number=to_int_any(game_number_txt or (game_name or "")),
         game_name=game_name,
         price=to_float_money(price_txt),
@@ -166,15 +294,15 @@ def normalize_row(row: Dict[str, str], state: str) -> ScratchRow:
         detail_url=detail_url
     )
 
-def scrape_game_details(url: str) -> List[Dict]:
+def scrape_game_details(session: requests.Session, url: str) -> List[Dict]:
     """
     Visits the game detail page and scrapes the prize table.
     Returns a list of dicts: [{'prize': float, 'remaining': int, 'is_ticket': bool}]
     """
     print(f"  Fetching details: {url}")
     try:
-        html = fetch_html(url)
-        soup = BeautifulSoup(html, "lxml")
+        html = fetch_html(session, url)
+        tree = LexborHTMLParser(html)
         
         # Look for the prize table. It often has "Tier", "Prize", "Remaining" headers.
         # Based on inspection: <td data-title="Prize"> and <td data-title="Remaining">
@@ -182,13 +310,12 @@ def scrape_game_details(url: str) -> List[Dict]:
         prize_data = []
         
         # Find any table that contains prize info
-        tables = soup.find_all("table")
         target_table = None
         
-        for tbl in tables:
+        for tbl in tree.css("table"):
             # Check for specific headers or data attributes
-            if tbl.find("td", attrs={"data-title": "Prize"}) or \
-               tbl.find("th", string=re.compile("Prize", re.I)):
+            if tbl.css_first('td[data-title="Prize"]') or \
+               any("prize" in th.text().lower() for th in tbl.css("th")):
                 target_table = tbl
                 break
         
@@ -196,26 +323,17 @@ def scrape_game_details(url: str) -> List[Dict]:
             print(f"  WARNING: No prize table found for {url}")
             return []
 
-        # Parse rows
-        rows = target_table.find_all("tr")
-        for row in rows:
-            # Use data-title attribute if available (more robust)
-            prize_cell = row.find("td", attrs={"data-title": "Prize"})
-            rem_cell = row.find("td", attrs={"data-title": "Remaining"})
-            
-            # Fallback to index if data-title is missing (skip header row)
-            if not prize_cell or not rem_cell:
-                tds = row.find_all("td")
-                if len(tds) >= 3: # Assuming Tier, Prize, ..., Remaining structure
-                    # Heuristics for column index could be added here if needed
-                    # For now relying on data-title as primary method based on inspection
-                    continue 
+        # Parse rows; data-title attributes are more robust than column index.
+        # Header rows (no data-title cells) are skipped.
+        for row in target_table.css("tr"):
+            prize_cell = row.css_first('td[data-title="Prize"]')
+            rem_cell = row.css_first('td[data-title="Remaining"]')
 
             if prize_cell and rem_cell:
-                prize_text = clean(prize_cell.get_text())
-                rem_text = clean(rem_cell.get_text())
+                prize_text = node_text(prize_cell)
+                rem_text = node_text(rem_cell)
                 
-                is_ticket = "ticket" in prize_text.lower() or "free" in prize_text.lower()
+                is_ticket = TICKET_RE.search(prize_text) is not None
                 prize_val = to_float_money(prize_text)
                 rem_val = to_int_any(rem_text)
                 
@@ -232,6 +350,33 @@ def scrape_game_details(url: str) -> List[Dict]:
         print(f"  ERROR scraping details for {url}: {e}")
         return []
 
+def load_detail_cache(path: str = DETAIL_CACHE_FILE) -> Dict[str, Dict]:
+    """Load the {detail_url: {'ts': epoch_seconds, 'prize_data': [...]}} cache, or {} if unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def is_fresh(entry, ttl: float, now: float) -> bool:
+    """True if a detail cache entry is well-formed and younger than ttl seconds."""
+    if not isinstance(entry, dict) or not entry.get("prize_data"):
+        return False
+    ts = entry.get("ts")
+    return isinstance(ts, (int, float)) and now - ts < ttl
+
+def save_detail_cache(cache: Dict[str, Dict], path: str = DETAIL_CACHE_FILE) -> None:
+    """Atomically replace the cache file; a unique temp file keeps concurrent writers apart."""
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(path)),
+                                     prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False) as f:
+        json.dump(cache, f)
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
 def calculate_ev(row: ScratchRow) -> Optional[float]:
     """
     Calculate True EV = (Sum(Prize * Remaining) / Sum(Remaining))
@@ -257,33 +402,38 @@ def calculate_ev(row: ScratchRow) -> Optional[float]:
         
     return total_value / total_remaining
 
-def scrape_lottery_net(state_abbr: str = "NJ") -> Union[List[ScratchRow], pd.DataFrame]:
+def scrape_lottery_net(state_abbr: str = "NJ", cache_ttl: float = DETAIL_CACHE_TTL) -> Union[List[ScratchRow], pd.DataFrame]:
     slug = STATE_SLUGS.get(state_abbr.upper())
     if not slug:
         raise ValueError(f"State {state_abbr} not supported. Available: {list(STATE_SLUGS.keys())}")
     
     url = f"{BASE_URL}/{slug}/scratch-offs"
+    session = make_session()
     print(f"Scraping main list: {url}")
-    html = fetch_html(url)
-    soup = BeautifulSoup(html, "lxml")
-
-    # Prefer tables with clear headers; fallback to any table with 'Odds' column
-    candidate_tables = []
-    for tbl in soup.find_all("table"):
-        headers = [clean(h.get_text(" ")).lower() for h in tbl.find_all("th")]
+    html = fetch_html(session, url)
+    tree = LexborHTMLParser(html)
+
+    # The listing page has a single games table: take the first one with an 'Odds'
+    # column plus a game/prize/price column and skip the trailing nav/footer tables
+    target_table = None
+    for tbl in tree.css("table"):
+        headers = [node_text(h).lower() for h in tbl.css("th")]
         if not headers:
             # try first row cells as headers
-            first_tr = tbl.find("tr")
+            first_tr = tbl.css_first("tr")
             if first_tr:
-                headers = [clean(h.get_text(" ")).lower() for h in first_tr.find_all(["th", "td"])]
+                headers = [node_text(h).lower() for h in first_tr.css("th, td")]
         if any("odds" in h for h in headers) and any(("game" in h or "prize" in h or "price" in h) for h in headers):
-            candidate_tables.append(tbl)
+            target_table = tbl
+            break
 
     rows: List[ScratchRow] = []
-    for tbl in candidate_tables:
-        raw_rows = parse_table(tbl)
+    scrape_ts = now_iso()
+    if target_table is not None:
+        headers, raw_rows = parse_table(target_table)
+        resolved = resolve_headers(headers)
         for raw in raw_rows:
-            norm = normalize_row(raw, state_abbr)
+            norm = normalize_row(raw, state_abbr, resolved, scrape_ts)
             # must at least have a name or odds/price to be meaningful
             if norm.game_name or norm.overall_odds_1_in or norm.price:
                 # Deduplication check inside the loop to avoid scraping details for dupes?
@@ -300,34 +450,66 @@ def scrape_lottery_net(state_abbr: str = "NJ") -> Union[List[ScratchRow], pd.Dat
         seen.add(key)
         unique_rows.append(r)
     
-    print(f"Found {len(unique_rows)} games. Fetching details...")
-    
-    # Fetch details and calculate EV
-    consecutive_failures = 0
-    MAX_CONSECUTIVE_FAILURES = 3
-    
-    print(f"Found {len(unique_rows)} games. Fetching details...")
-
+    # Reuse prize tables fetched within cache_ttl seconds; only stale games hit the network.
+    # cache_ttl=0 skips the lookup but still refreshes the file for later runs.
+    now = time.time()
+    cache = load_detail_cache()
+    pending: List[ScratchRow] = []
     for r in unique_rows:
-        # If we've hit too many errors (e.g. bulk 403s), skip remaining details to save time
-        if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-            # Optional: warn once
-            if consecutive_failures == MAX_CONSECUTIVE_FAILURES:
-                print("  WARNING: Stopping detailed scrape due to repeated failures (likely blocked).")
-                consecutive_failures += 1 # increment to avoid printing again
+        if not r.detail_url:
             continue
+        entry = cache.get(r.detail_url)
+        if is_fresh(entry, cache_ttl, now):
+            r.prize_data = entry["prize_data"]
+            r.true_ev = calculate_ev(r)
+        else:
+            pending.append(r)
+
+    print(f"Found {len(unique_rows)} games. Fetching details for {len(pending)} (rest cached)...")
 
-        if r.detail_url:
-            data = scrape_game_details(r.detail_url)
+    # Fetch details and calculate EV concurrently
+    consecutive_failures = 0
+    blocked = threading.Event()
+    lock = threading.Lock()
+
+    def fetch_details(r: ScratchRow) -> None:
+        nonlocal consecutive_failures
+        # If we've hit too many errors (e.g. bulk 403s), skip remaining details to save time
+        if blocked.is_set():
+            return
+        data = scrape_game_details(session, r.detail_url)
+        with lock:
             if not data:
                 consecutive_failures += 1
-            else:
-                consecutive_failures = 0
-                r.prize_data = data
-                r.true_ev = calculate_ev(r)
-            
-            time.sleep(1) # Be polite and avoid 403s
-        
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES and not blocked.is_set():
+                    print("  WARNING: Stopping detailed scrape due to repeated failures (likely blocked).")
+                    blocked.set()
+                return
+            consecutive_failures = 0
+            cache[r.detail_url] = {"ts": time.time(), "prize_data": data}
+        r.prize_data = data
+        r.true_ev = calculate_ev(r)
+
+    executor = ThreadPoolExecutor(max_workers=DETAIL_WORKERS)
+    try:
+        futures = [executor.submit(fetch_details, r) for r in pending]
+        for fut in as_completed(futures):
+            fut.result()
+            if blocked.is_set():
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+    finally:
+        executor.shutdown(wait=True)
+        session.close()
+
+    # Drop expired or malformed entries so games that left the list don't linger forever
+    keep = max(cache_ttl, DETAIL_CACHE_TTL)
+    cache = {url: entry for url, entry in cache.items() if is_fresh(entry, keep, now)}
+    try:
+        save_detail_cache(cache)
+    except OSError as e:
+        print(f"  WARNING: Could not write detail cache: {e}")
+
     return unique_rows
 
 # ---------- I/O ----------
@@ -344,41 +526,49 @@ def rows_to_csv(rows: List[ScratchRow], path: str) -> None:
         for r in rows:
             w.writerow(asdict(r))
 
+# Numeric ScratchRow fields; float64 so missing values become NaN
+NUMERIC_DTYPES = {
+    "game_number": np.float64,
+    "price": np.float64,
+    "overall_odds_1_in": np.float64,
+    "top_prize_amount": np.float64,
+    "top_prizes_remaining": np.float64,
+    "all_prizes_remaining": np.float64,
+    "true_ev": np.float64,
+}
+
 def rows_to_dataframe(rows: List[ScratchRow]) -> pd.DataFrame:
     """Convert list of ScratchRow objects to pandas DataFrame."""
     if not rows:
         return pd.DataFrame()
     
-    # Convert to list of dictionaries
-    data = [asdict(row) for row in rows]
-    df = pd.DataFrame(data)
-    
-    # Ensure proper data types
-    df['game_number'] = pd.to_numeric(df['game_number'], errors='coerce')
-    df['price'] = pd.to_numeric(df['price'], errors='coerce')
-    df['overall_odds_1_in'] = pd.to_numeric(df['overall_odds_1_in'], errors='coerce')
-    df['top_prize_amount'] = pd.to_numeric(df['top_prize_amount'], errors='coerce')
-    df['top_prizes_remaining'] = pd.to_numeric(df['top_prizes_remaining'], errors='coerce')
-    df['all_prizes_remaining'] = pd.to_numeric(df['all_prizes_remaining'], errors='coerce')
-    df['true_ev'] = pd.to_numeric(df['true_ev'], errors='coerce')
+    # Build column-wise lists; avoids asdict's recursive copy of prize_data
+    names = [f.name for f in fields(ScratchRow)]
+    cols = {name: [getattr(row, name) for row in rows] for name in names}
     
-    return df
+    # Numeric columns are typed up front (None -> NaN)
+    return pd.DataFrame({
+        name: np.asarray(values, dtype=NUMERIC_DTYPES[name]) if name in NUMERIC_DTYPES else values
+        for name, values in cols.items()
+    })
 
-def scrape_lottery_net_df(state_abbr: str = "NJ") -> pd.DataFrame:
+def scrape_lottery_net_df(state_abbr: str = "NJ", cache_ttl: float = DETAIL_CACHE_TTL) -> pd.DataFrame:
     """Scrape lottery data and return as pandas DataFrame."""
-    rows = scrape_lottery_net(state_abbr)
+    rows = scrape_lottery_net(state_abbr, cache_ttl)
     return rows_to_dataframe(rows)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--state", help="State abbreviation (e.g. NJ, NY, TX)", default="NJ")
     ap.add_argument("--csv", help="write normalized CSV to this path", default="lottery_net_scratchoffs.csv")
+    ap.add_argument("--cache-ttl", type=float, default=DETAIL_CACHE_TTL,
+                    help="reuse cached prize tables younger than this many seconds (0 refetches every game)")
     ap.add_argument("--dataframe", action="store_true", help="return DataFrame instead of JSON")
     args = ap.parse_args()
 
     if args.dataframe:
         # Return DataFrame for use in other scripts
-        df = scrape_lottery_net_df(args.state)
+        df = scrape_lottery_net_df(args.state, args.cache_ttl)
         print(f"DataFrame shape: {df.shape}")
         print(f"Columns: {list(df.columns)}")
         print(f"First few rows:")
@@ -386,7 +576,7 @@ def main():
         # return df # Removed return as main() shouldn't return in script mode
     else:
         # Original behavior - JSON output and CSV save
-        rows = scrape_lottery_net(args.state)
+        rows = scrape_lottery_net(args.state, args.cache_ttl)
         print(rows_to_json(rows))
         # Always write CSV (to provided path or default)
         rows_to_csv(rows, args.csv)